@@ -107,3 +107,12 @@ class BusinessLogicException(ServiceException):
     """Raised when business logic rules are violated"""
     def __init__(self, message: str):
         super().__init__(message, status.HTTP_422_UNPROCESSABLE_ENTITY, 'BUSINESS_LOGIC_ERROR')
+
+
+class ResourceLockedException(ServiceException):
+    """Raised when a resource is being processed by a concurrent request"""
+    def __init__(self, resource: str, identifier: str):
+        message = f"{resource} with identifier '{identifier}' is being processed by another request"
+        super().__init__(message, status.HTTP_409_CONFLICT, 'RESOURCE_LOCKED')
+        self.resource = resource
+        self.identifier = identifier
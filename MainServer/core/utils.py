@@ -1,5 +1,5 @@
 """General utility functions"""
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List
 import hashlib
 import secrets
 import string
@@ -63,6 +63,30 @@ def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
     return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
 
 
+def batched(iterable: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Lazily split any iterable into lists of specified size.
+    
+    Unlike chunk_list, the input is consumed one batch at a time, so it
+    can be used with QuerySet.iterator() without loading every row.
+    
+    Args:
+        iterable: Iterable to batch
+        batch_size: Size of each batch
+        
+    Yields:
+        Lists of at most batch_size items
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def flatten_dict(data: Dict[str, Any], parent_key: str = '', sep: str = '__') -> Dict[str, Any]:
     """
     Flatten nested dictionary.
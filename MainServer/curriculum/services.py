@@ -2,21 +2,116 @@
 Business logic for curriculum comparison operations.
 All curriculum comparison logic should be here.
 """
-from typing import List, Dict, Optional, Tuple
-from difflib import SequenceMatcher
-from django.db.models import QuerySet, Q
+from collections import Counter
+from functools import lru_cache
+import time
+from typing import List, Dict, Optional, Set, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process
+from django.db.models import QuerySet, Q, Case, When, Value, BooleanField
 from django.db import transaction, models
+from django.core.cache import cache
 from core.exceptions import (
     ValidationException,
     ResourceNotFoundException,
-    BusinessLogicException
+    BusinessLogicException,
+    ResourceLockedException
 )
 from core.decorators import log_execution, atomic_transaction
+from core.utils import batched
 from .models import CompareResultTOR, CitTorContent
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Allowed credit evaluation values, computed once at import
+_VALID_EVALUATIONS = frozenset(choice.value for choice in CompareResultTOR.CreditEvaluation)
+_VALID_EVALUATIONS_TEXT = ', '.join(choice.value for choice in CompareResultTOR.CreditEvaluation)
+
+# Normalized Indel ratio. Scores run at or above the SequenceMatcher ratio
+# the 20/50/80 bands were set for (never below); the evaluation band test
+# in curriculum/test/test_services.py is the calibration check
+SIMILARITY_SCORER = fuzz.ratio
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normalize a description for similarity scoring (strip + lowercase)"""
+    return (text or "").strip().lower()
+
+
+# Shared cache key holding the current CIT curriculum version
+CIT_CACHE_VERSION_KEY = 'curriculum:cit_version'
+
+# Bumped alongside the shared version so this process never depends on
+# the cache backend to see its own changes
+_local_cit_version = 0
+
+
+def get_cit_cache_version() -> Optional[int]:
+    """
+    Get the current CIT curriculum version, seeding it if missing.
+    
+    Returns:
+        Shared version, or None if the cache backend is unavailable
+    """
+    try:
+        # Seeded from the clock rather than 0 so an evicted key never maps
+        # back to a version some worker already has cached
+        return cache.get_or_set(CIT_CACHE_VERSION_KEY, time.time_ns(), timeout=None)
+    except Exception as e:
+        logger.warning(f"Could not read CIT cache version: {e}")
+        return None
+
+
+def bump_cit_cache_version() -> None:
+    """Invalidate every process's cached CIT curriculum"""
+    global _local_cit_version
+    _local_cit_version += 1
+    
+    try:
+        try:
+            cache.incr(CIT_CACHE_VERSION_KEY)
+        except ValueError:
+            cache.set(CIT_CACHE_VERSION_KEY, time.time_ns(), timeout=None)
+    except Exception as e:
+        logger.warning(f"Could not bump CIT cache version: {e}")
+
+
+def _cit_changes_pending() -> bool:
+    """
+    Check whether the current transaction has uncommitted CIT changes.
+    
+    Relies on Django keeping pending on_commit callbacks (as tuples that
+    hold the callable) in connection.run_on_commit until commit, and on
+    dropping them on rollback. Only the callable is matched, not its
+    position in the tuple, which has changed between Django releases.
+    """
+    return any(
+        bump_cit_cache_version in callback
+        for callback in transaction.get_connection().run_on_commit
+    )
+
+
+def _fetch_cit_curriculum() -> List[Dict]:
+    """Load and normalize the active CIT curriculum from the database"""
+    cit_cache = list(
+        CitTorContent.objects.filter(is_active=True).values(
+            'subject_code', 'description', 'units'
+        )
+    )
+    for cit in cit_cache:
+        cit['normalized_descriptions'] = [
+            normalize_text(desc) for desc in cit['description']
+        ]
+        cit['combined_description'] = normalize_text(" ".join(cit['description']))
+    return cit_cache
+
+
+@lru_cache(maxsize=1)
+def _load_cit_cache(shared_version: int, local_version: int) -> List[Dict]:
+    """Memoized CIT curriculum for one version"""
+    return _fetch_cit_curriculum()
+
 
 class CurriculumService:
     """
@@ -33,6 +128,9 @@ class CurriculumService:
     # Similarity threshold
     SIMILARITY_THRESHOLD = 20.0  # Minimum % for match
     
+    # Rows fetched, scored and bulk-updated per batch
+    CHUNK_SIZE = 500
+    
     @staticmethod
     def calculate_similarity(text1: str, text2: str) -> float:
         """
@@ -45,78 +143,250 @@ class CurriculumService:
         Returns:
             Similarity percentage (0-100)
         """
+        text1 = normalize_text(text1)
+        text2 = normalize_text(text2)
+        
         if not text1 or not text2:
             return 0.0
         
-        ratio = SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
-        return ratio * 100
+        return SIMILARITY_SCORER(text1, text2)
+    
+    @staticmethod
+    def annotate_passing(queryset: QuerySet[CompareResultTOR]) -> QuerySet[CompareResultTOR]:
+        """
+        Annotate entries with a database-computed `passing` flag.
+        
+        Same check as CompareResultTOR.is_passing_grade (standard scale),
+        evaluated once per row by the database instead of per access.
+        
+        Args:
+            queryset: CompareResultTOR queryset
+            
+        Returns:
+            Queryset with a boolean `passing` annotation
+        """
+        return queryset.annotate(
+            passing=Case(
+                When(
+                    final_grade__range=(
+                        CurriculumService.STANDARD_PASSING_MIN,
+                        CurriculumService.STANDARD_PASSING_MAX
+                    ),
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        )
+    
+    @staticmethod
+    def lock_account(account_id: str) -> None:
+        """
+        Take an account-level lock for the current transaction.
+        
+        Uses a PostgreSQL transaction-scoped advisory lock, so a concurrent
+        grading or sync run for the same account fails fast instead of
+        waiting and redoing the same work. The lock is released on commit
+        or rollback.
+        
+        Args:
+            account_id: Student account ID
+            
+        Raises:
+            ResourceLockedException: If another transaction holds the lock
+        """
+        connection = transaction.get_connection()
+        
+        # Advisory locks are PostgreSQL-only
+        if connection.vendor != 'postgresql':
+            return
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_try_advisory_xact_lock(hashtext(%s))",
+                [f"curriculum:account:{account_id}"]
+            )
+            acquired = cursor.fetchone()[0]
+        
+        if not acquired:
+            raise ResourceLockedException("TOR entries", account_id)
+    
+    @staticmethod
+    def load_cit_cache() -> List[Dict]:
+        """
+        Load the active CIT curriculum as plain dicts.
+        
+        The list is memoized per process and reloaded only after
+        CitTorContent changes are committed (see curriculum.signals). It
+        is shared between requests and must not be mutated.
+        
+        Returns:
+            List of dicts with subject_code, description, units,
+            normalized_descriptions and combined_description
+        """
+        shared_version = get_cit_cache_version()
+        
+        # Uncommitted changes must not reach the shared memo, and without
+        # the cache backend other workers' changes cannot be detected
+        if shared_version is None or _cit_changes_pending():
+            return _fetch_cit_curriculum()
+        
+        return _load_cit_cache(shared_version, _local_cit_version)
+    
+    @staticmethod
+    def build_cit_lookups(cit_cache: List[Dict]) -> Tuple[Counter, Set[int]]:
+        """
+        Build constant-time lookups for subject code and units checks.
+        
+        Args:
+            cit_cache: Active CIT subjects as dicts (see load_cit_cache)
+            
+        Returns:
+            Tuple of (subject code occurrence counts, set of unit values)
+        """
+        code_counts = Counter(cit['subject_code'] for cit in cit_cache)
+        units_set = {cit['units'] for cit in cit_cache}
+        return code_counts, units_set
+    
+    @staticmethod
+    def calculate_similarity_matrix(
+        queries: List[str],
+        choices: List[str]
+    ) -> np.ndarray:
+        """
+        Calculate similarity percentages for every (query, choice) pair.
+        
+        Scores the whole matrix in a single RapidFuzz call instead of
+        comparing pairs one at a time in Python. Repeated queries are only
+        scored once.
+        
+        Args:
+            queries: Normalized texts to match (one row each)
+            choices: Normalized texts to match against (one column each)
+            
+        Returns:
+            Array of shape (len(queries), len(choices)) with values 0-100,
+            0 wherever either text is empty
+        """
+        if not queries or not choices:
+            return np.zeros((len(queries), len(choices)), dtype=np.float32)
+        
+        unique_queries = list(dict.fromkeys(queries))
+        
+        scores = process.cdist(
+            unique_queries,
+            choices,
+            scorer=SIMILARITY_SCORER,
+            dtype=np.float32,
+            workers=-1
+        )
+        
+        # Empty texts never match, as in calculate_similarity
+        scores[[not query for query in unique_queries]] = 0.0
+        scores[:, [not choice for choice in choices]] = 0.0
+        
+        if len(unique_queries) == len(queries):
+            return scores
+        
+        rows = {query: i for i, query in enumerate(unique_queries)}
+        return scores[[rows[query] for query in queries]]
+    
+    @staticmethod
+    def find_description_matches(
+        entries: List[CompareResultTOR],
+        cit_cache: List[Dict]
+    ) -> List[Tuple[float, Optional[str]]]:
+        """
+        Find the best matching CIT description for each TOR entry.
+        
+        Every description variation of every CIT subject is scored against
+        every TOR description in one batch.
+        
+        Args:
+            entries: CompareResultTOR instances
+            cit_cache: Active CIT subjects as dicts (see load_cit_cache)
+            
+        Returns:
+            List of (best similarity, matched subject code) per entry,
+            in the same order as entries
+        """
+        description_codes = []
+        description_texts = []
+        
+        for cit in cit_cache:
+            for desc in cit['normalized_descriptions']:
+                description_codes.append(cit['subject_code'])
+                description_texts.append(desc)
+        
+        if not description_texts:
+            return [(0.0, None)] * len(entries)
+        
+        scores = CurriculumService.calculate_similarity_matrix(
+            [normalize_text(entry.subject_description) for entry in entries],
+            description_texts
+        )
+        best_idx = scores.argmax(axis=1)
+        best_scores = scores.max(axis=1)
+        
+        return [
+            (float(score), description_codes[idx] if score > 0 else None)
+            for idx, score in zip(best_idx, best_scores)
+        ]
     
     @staticmethod
     def generate_summary(
         entry: CompareResultTOR,
-        cit_entries: QuerySet[CitTorContent]
+        cit_lookups: Tuple[Counter, Set[int]],
+        description_match: Tuple[float, Optional[str]]
     ) -> str:
         """
         Generate detailed comparison summary for a TOR entry.
         
         Args:
-            entry: CompareResultTOR instance
-            cit_entries: QuerySet of CitTorContent
+            entry: CompareResultTOR instance annotated by annotate_passing
+            cit_lookups: Code counts and units set (see build_cit_lookups)
+            description_match: Best (similarity, subject code) for the entry,
+                as returned by find_description_matches
             
         Returns:
             Generated summary text
         """
-        lines = []
+        code_counts, units_set = cit_lookups
+        units = int(entry.total_academic_units)
         
         # Subject Code check
-        matches = cit_entries.filter(subject_code=entry.subject_code)
-        match_count = matches.count()
+        match_count = code_counts.get(entry.subject_code, 0)
         
         if match_count == 0:
-            lines.append("⚠ Subject Code: No matches found in CIT curriculum")
+            code_line = "⚠ Subject Code: No matches found in CIT curriculum"
         elif match_count == 1:
-            lines.append("✓ Subject Code: Exact match found in CIT curriculum")
+            code_line = "✓ Subject Code: Exact match found in CIT curriculum"
         else:
-            lines.append(f"⚠ Subject Code: {match_count} matches found (review needed)")
+            code_line = f"⚠ Subject Code: {match_count} matches found (review needed)"
         
         # Description similarity
-        best_match = 0.0
-        best_match_subject = None
-        
-        for cit in cit_entries:
-            for desc in cit.description:
-                similarity = CurriculumService.calculate_similarity(
-                    entry.subject_description,
-                    desc
-                )
-                if similarity > best_match:
-                    best_match = similarity
-                    best_match_subject = cit.subject_code
+        best_match, best_match_subject = description_match
         
         if best_match >= 80:
-            lines.append(f"✓ Description: {best_match:.1f}% match with {best_match_subject}")
+            description_line = f"✓ Description: {best_match:.1f}% match with {best_match_subject}"
         elif best_match >= 50:
-            lines.append(f"⚠ Description: {best_match:.1f}% match with {best_match_subject} (review needed)")
+            description_line = f"⚠ Description: {best_match:.1f}% match with {best_match_subject} (review needed)"
         else:
-            lines.append(f"✗ Description: Low similarity ({best_match:.1f}%)")
+            description_line = f"✗ Description: Low similarity ({best_match:.1f}%)"
         
         # Units check
-        units_match = cit_entries.filter(
-            units=int(entry.total_academic_units)
-        ).exists()
-        
-        if units_match:
-            lines.append(f"✓ Units: {int(entry.total_academic_units)} units matches curriculum")
+        if units in units_set:
+            units_line = f"✓ Units: {units} units matches curriculum"
         else:
-            lines.append(f"⚠ Units: {int(entry.total_academic_units)} units - verify equivalency")
+            units_line = f"⚠ Units: {units} units - verify equivalency"
         
         # Grade check
-        if entry.is_passing_grade:
-            lines.append(f"✓ Grade: {entry.final_grade} (Passing)")
+        if entry.passing:
+            grade_line = f"✓ Grade: {entry.final_grade} (Passing)"
         else:
-            lines.append(f"✗ Grade: {entry.final_grade} (Not passing)")
+            grade_line = f"✗ Grade: {entry.final_grade} (Not passing)"
         
-        return "\n".join(lines)
+        return f"{code_line}\n{description_line}\n{units_line}\n{grade_line}"
     
     @staticmethod
     @log_execution
@@ -134,37 +404,51 @@ class CurriculumService:
         Raises:
             ValidationException: If account_id is missing
             ResourceNotFoundException: If no entries found
+            ResourceLockedException: If the account is already being graded
         """
         if not account_id:
             raise ValidationException("Account ID is required")
         
-        entries = CompareResultTOR.objects.filter(account_id=account_id)
+        CurriculumService.lock_account(account_id)
         
-        if not entries.exists():
-            raise ResourceNotFoundException("TOR entries", account_id)
-        
-        cit_entries = CitTorContent.objects.filter(is_active=True)
+        entries = CurriculumService.annotate_passing(
+            CompareResultTOR.objects.filter(account_id=account_id)
+        )
+        cit_cache = CurriculumService.load_cit_cache()
+        cit_lookups = CurriculumService.build_cit_lookups(cit_cache)
         updated_entries = []
+        chunk_size = CurriculumService.CHUNK_SIZE
         
-        for entry in entries:
-            # Apply standard grading
-            if CurriculumService.STANDARD_PASSING_MIN <= entry.final_grade <= CurriculumService.STANDARD_PASSING_MAX:
-                entry.remarks = "PASSED"
-            elif CurriculumService.STANDARD_FAILING_MIN <= entry.final_grade <= CurriculumService.STANDARD_FAILING_MAX:
-                entry.remarks = "FAILED"
-            else:
-                entry.remarks = "INVALID GRADE"
+        for chunk in batched(entries.iterator(chunk_size=chunk_size), chunk_size):
+            description_matches = CurriculumService.find_description_matches(
+                chunk, cit_cache
+            )
             
-            # Generate summary
-            entry.summary = CurriculumService.generate_summary(entry, cit_entries)
-            updated_entries.append(entry)
-        
-        # Bulk update
-        CompareResultTOR.objects.bulk_update(
-            updated_entries,
-            ['remarks', 'summary', 'updated_at'],
-            batch_size=100
-        )
+            for entry, description_match in zip(chunk, description_matches):
+                # Apply standard grading
+                if entry.passing:
+                    entry.remarks = "PASSED"
+                elif CurriculumService.STANDARD_FAILING_MIN <= entry.final_grade <= CurriculumService.STANDARD_FAILING_MAX:
+                    entry.remarks = "FAILED"
+                else:
+                    entry.remarks = "INVALID GRADE"
+                
+                # Generate summary
+                entry.summary = CurriculumService.generate_summary(
+                    entry, cit_lookups, description_match
+                )
+            
+            # Bulk update this chunk
+            CompareResultTOR.objects.bulk_update(
+                chunk,
+                ['remarks', 'summary', 'updated_at'],
+                batch_size=chunk_size
+            )
+            updated_entries.extend(chunk)
+        
+        # No chunk was produced, so the account has no entries
+        if not updated_entries:
+            raise ResourceNotFoundException("TOR entries", account_id)
         
         logger.info(
             f"Applied standard grading for {len(updated_entries)} entries "
@@ -190,33 +474,46 @@ class CurriculumService:
         if not account_id:
             raise ValidationException("Account ID is required")
         
-        entries = CompareResultTOR.objects.filter(account_id=account_id)
+        CurriculumService.lock_account(account_id)
         
-        if not entries.exists():
-            raise ResourceNotFoundException("TOR entries", account_id)
-        
-        cit_entries = CitTorContent.objects.filter(is_active=True)
+        entries = CurriculumService.annotate_passing(
+            CompareResultTOR.objects.filter(account_id=account_id)
+        )
+        cit_cache = CurriculumService.load_cit_cache()
+        cit_lookups = CurriculumService.build_cit_lookups(cit_cache)
         updated_entries = []
+        chunk_size = CurriculumService.CHUNK_SIZE
         
-        for entry in entries:
-            # Apply reverse grading
-            if CurriculumService.STANDARD_FAILING_MIN <= entry.final_grade <= CurriculumService.STANDARD_FAILING_MAX:
-                entry.remarks = "PASSED"
-            elif CurriculumService.STANDARD_PASSING_MIN <= entry.final_grade <= CurriculumService.STANDARD_PASSING_MAX:
-                entry.remarks = "FAILED"
-            else:
-                entry.remarks = "INVALID GRADE"
+        for chunk in batched(entries.iterator(chunk_size=chunk_size), chunk_size):
+            description_matches = CurriculumService.find_description_matches(
+                chunk, cit_cache
+            )
             
-            # Generate summary
-            entry.summary = CurriculumService.generate_summary(entry, cit_entries)
-            updated_entries.append(entry)
-        
-        # Bulk update
-        CompareResultTOR.objects.bulk_update(
-            updated_entries,
-            ['remarks', 'summary', 'updated_at'],
-            batch_size=100
-        )
+            for entry, description_match in zip(chunk, description_matches):
+                # Apply reverse grading
+                if CurriculumService.STANDARD_FAILING_MIN <= entry.final_grade <= CurriculumService.STANDARD_FAILING_MAX:
+                    entry.remarks = "PASSED"
+                elif entry.passing:
+                    entry.remarks = "FAILED"
+                else:
+                    entry.remarks = "INVALID GRADE"
+                
+                # Generate summary
+                entry.summary = CurriculumService.generate_summary(
+                    entry, cit_lookups, description_match
+                )
+            
+            # Bulk update this chunk
+            CompareResultTOR.objects.bulk_update(
+                chunk,
+                ['remarks', 'summary', 'updated_at'],
+                batch_size=chunk_size
+            )
+            updated_entries.extend(chunk)
+        
+        # No chunk was produced, so the account has no entries
+        if not updated_entries:
+            raise ResourceNotFoundException("TOR entries", account_id)
         
         logger.info(
             f"Applied reverse grading for {len(updated_entries)} entries "
@@ -246,33 +543,40 @@ class CurriculumService:
         
         transferee_entries = TorTransferee.objects.filter(account_id=account_id)
         
-        if not transferee_entries.exists():
+        new_entries = [
+            CompareResultTOR(
+                account_id=entry.account_id,
+                subject_code=entry.subject_code,
+                subject_description=entry.subject_description,
+                total_academic_units=entry.total_academic_units,
+                final_grade=entry.final_grade,
+                remarks=entry.remarks or '',
+                summary='',
+                credit_evaluation=CompareResultTOR.CreditEvaluation.VOID
+            )
+            for entry in transferee_entries.iterator(chunk_size=1000)
+        ]
+        
+        if not new_entries:
             raise ResourceNotFoundException("Transferee TOR entries", account_id)
         
-        compare_entries = []
-        created_count = 0
+        # Existing (account_id, subject_code) rows are kept as-is
+        CompareResultTOR.objects.bulk_create(
+            new_entries,
+            ignore_conflicts=True,
+            batch_size=1000
+        )
         
-        for entry in transferee_entries:
-            compare_entry, created = CompareResultTOR.objects.get_or_create(
-                account_id=entry.account_id,
-                subject_code=entry.subject_code,
-                defaults={
-                    'subject_description': entry.subject_description,
-                    'total_academic_units': entry.total_academic_units,
-                    'final_grade': entry.final_grade,
-                    'remarks': entry.remarks or '',
-                    'summary': '',
-                    'credit_evaluation': CompareResultTOR.CreditEvaluation.VOID
-                }
+        # Return all entries (both new and existing)
+        compare_entries = list(
+            CompareResultTOR.objects.filter(
+                account_id=account_id,
+                subject_code__in={entry.subject_code for entry in new_entries}
             )
-            
-            # Add all entries (both new and existing)
-            compare_entries.append(compare_entry)
-            if created:
-                created_count += 1
+        )
         
         logger.info(
-            f"Copied {created_count} new TOR entries (total: {len(compare_entries)}) "
+            f"Copied TOR entries (total: {len(compare_entries)}) "
             f"for account: {account_id}"
         )
         
@@ -294,77 +598,108 @@ class CurriculumService:
         if not account_id:
             raise ValidationException("Account ID is required")
         
-        tor_entries = CompareResultTOR.objects.filter(account_id=account_id)
+        CurriculumService.lock_account(account_id)
         
-        if not tor_entries.exists():
-            raise ResourceNotFoundException("TOR entries", account_id)
+        # Only load the columns used for matching and the returned rows
+        tor_entries = CurriculumService.annotate_passing(
+            CompareResultTOR.objects.filter(account_id=account_id)
+        ).only(
+            'id',
+            'subject_code',
+            'subject_description',
+            'total_academic_units',
+            'final_grade',
+            'remarks',
+            'summary',
+            'credit_evaluation',
+            'updated_at'
+        )
         
-        cit_contents = CitTorContent.objects.filter(is_active=True)
+        cit_cache = CurriculumService.load_cit_cache()
+        cit_descs = [c['combined_description'] for c in cit_cache]
+        cit_codes = np.array([c['subject_code'] for c in cit_cache], dtype=object)
         result_data = []
-        updated_entries = []
+        chunk_size = CurriculumService.CHUNK_SIZE
         
-        for tor in tor_entries:
-            best_match = None
-            best_accuracy = 0.0
+        for chunk in batched(tor_entries.iterator(chunk_size=chunk_size), chunk_size):
+            # Score every TOR description in the chunk against every CIT subject at once
+            tor_descs = [normalize_text(t.subject_description) for t in chunk]
+            scores = CurriculumService.calculate_similarity_matrix(tor_descs, cit_descs)
             
-            # Find best matching CIT subject
-            for cit in cit_contents:
-                combined_desc = " ".join(cit.description)
-                accuracy = CurriculumService.calculate_similarity(
-                    tor.subject_description,
-                    combined_desc
-                )
-                
-                if accuracy > best_accuracy:
-                    best_accuracy = accuracy
-                    best_match = cit
+            if cit_cache:
+                best_idx = scores.argmax(axis=1)
+                best_acc = scores.max(axis=1)
+                has_match = best_acc > 0
+                matched_subjects = np.where(has_match, cit_codes[best_idx], None)
+            else:
+                best_idx = np.zeros(len(tor_descs), dtype=np.intp)
+                best_acc = np.zeros(len(tor_descs), dtype=np.float32)
+                matched_subjects = np.full(len(tor_descs), None, dtype=object)
             
-            # Generate summary based on match quality
-            if best_accuracy >= CurriculumService.SIMILARITY_THRESHOLD:
-                tor.summary = (
-                    f"✓ Match Found\n"
-                    f"CIT Subject: {best_match.subject_code}\n"
-                    f"Similarity: {int(best_accuracy)}%\n"
-                    f"Units: Student={int(tor.total_academic_units)}, CIT={best_match.units}"
-                )
+            # Whole-percent accuracy as shown in summaries and results
+            match_accuracy = best_acc.astype(np.int32)
+            
+            for tor, idx, accuracy, matched_subject in zip(
+                chunk,
+                best_idx.tolist(),
+                match_accuracy.tolist(),
+                matched_subjects.tolist()
+            ):
+                # Generate summary based on match quality
+                if accuracy >= CurriculumService.SIMILARITY_THRESHOLD:
+                    tor.summary = (
+                        f"✓ Match Found\n"
+                        f"CIT Subject: {matched_subject}\n"
+                        f"Similarity: {accuracy}%\n"
+                        f"Units: Student={int(tor.total_academic_units)}, CIT={cit_cache[idx]['units']}"
+                    )
                 
-                # Auto-suggest evaluation based on similarity
-                if best_accuracy >= 80 and tor.is_passing_grade:
-                    tor.credit_evaluation = CompareResultTOR.CreditEvaluation.ACCEPTED
-                elif best_accuracy >= 50:
-                    tor.credit_evaluation = CompareResultTOR.CreditEvaluation.VOID
+                    # Auto-suggest evaluation based on similarity
+                    if accuracy >= 80 and tor.passing:
+                        tor.credit_evaluation = CompareResultTOR.CreditEvaluation.ACCEPTED
+                    elif accuracy >= 50:
+                        tor.credit_evaluation = CompareResultTOR.CreditEvaluation.VOID
+                    else:
+                        tor.credit_evaluation = CompareResultTOR.CreditEvaluation.DENIED
                 else:
-                    tor.credit_evaluation = CompareResultTOR.CreditEvaluation.DENIED
-            else:
-                tor.summary = (
-                    f"✗ No Match Found\n"
-                    f"Description similarity below {CurriculumService.SIMILARITY_THRESHOLD}% threshold\n"
-                    f"Best match: {best_match.subject_code if best_match else 'None'} "
-                    f"({int(best_accuracy)}%)"
-                )
-                tor.credit_evaluation = CompareResultTOR.CreditEvaluation.INVESTIGATE
+                    tor.summary = (
+                        f"✗ No Match Found\n"
+                        f"Description similarity below {CurriculumService.SIMILARITY_THRESHOLD}% threshold\n"
+                        f"Best match: {matched_subject or 'None'} "
+                        f"({accuracy}%)"
+                    )
+                    tor.credit_evaluation = CompareResultTOR.CreditEvaluation.INVESTIGATE
             
-            # Add to bulk update list instead of saving individually
-            updated_entries.append(tor)
+            # Build result rows once the chunk is processed
+            result_data.extend(
+                {
+                    "subject_code": tor.subject_code,
+                    "subject_description": tor.subject_description,
+                    "total_academic_units": tor.total_academic_units,
+                    "final_grade": tor.final_grade,
+                    "remarks": tor.remarks,
+                    "summary": tor.summary,
+                    "credit_evaluation": tor.credit_evaluation,
+                    "match_accuracy": accuracy if matched_subject else 0,
+                    "matched_subject": matched_subject
+                }
+                for tor, accuracy, matched_subject in zip(
+                    chunk,
+                    match_accuracy.tolist(),
+                    matched_subjects.tolist()
+                )
+            )
             
-            result_data.append({
-                "subject_code": tor.subject_code,
-                "subject_description": tor.subject_description,
-                "total_academic_units": tor.total_academic_units,
-                "final_grade": tor.final_grade,
-                "remarks": tor.remarks,
-                "summary": tor.summary,
-                "credit_evaluation": tor.credit_evaluation,
-                "match_accuracy": int(best_accuracy) if best_match else 0,
-                "matched_subject": best_match.subject_code if best_match else None
-            })
-        
-        # Bulk update all entries at once (preserves data)
-        CompareResultTOR.objects.bulk_update(
-            updated_entries,
-            ['summary', 'credit_evaluation', 'updated_at'],
-            batch_size=100
-        )
+            # Bulk update this chunk (preserves data)
+            CompareResultTOR.objects.bulk_update(
+                chunk,
+                ['summary', 'credit_evaluation', 'updated_at'],
+                batch_size=chunk_size
+            )
+        
+        # No chunk was produced, so the account has no entries
+        if not result_data:
+            raise ResourceNotFoundException("TOR entries", account_id)
         
         logger.info(
             f"Synced {len(result_data)} entries with curriculum matching "
@@ -397,10 +732,9 @@ class CurriculumService:
             raise ResourceNotFoundException("CompareResultTOR", str(entry_id))
         
         # Validate evaluation
-        valid_evaluations = [choice.value for choice in CompareResultTOR.CreditEvaluation]
-        if evaluation not in valid_evaluations:
+        if evaluation not in _VALID_EVALUATIONS:
             raise ValidationException(
-                f"Invalid evaluation. Must be one of: {', '.join(valid_evaluations)}"
+                f"Invalid evaluation. Must be one of: {_VALID_EVALUATIONS_TEXT}"
             )
         
         entry.credit_evaluation = evaluation
@@ -445,17 +779,27 @@ class CurriculumService:
             subject_code__in=failed_subjects
         ).delete()
         
-        # Update passed subjects
+        # Update passed subjects in a single UPDATE (last entry wins on duplicates)
+        remarks_by_code = {
+            subject["subject_code"]: subject["remarks"]
+            for subject in passed_subjects
+        }
         updated_count = 0
-        for subject in passed_subjects:
-            updated = CompareResultTOR.objects.filter(
+        
+        if remarks_by_code:
+            updated_count = CompareResultTOR.objects.filter(
                 account_id=account_id,
-                subject_code=subject["subject_code"]
+                subject_code__in=list(remarks_by_code)
             ).update(
-                remarks=subject["remarks"],
+                remarks=Case(
+                    *[
+                        When(subject_code=code, then=Value(remarks))
+                        for code, remarks in remarks_by_code.items()
+                    ],
+                    output_field=models.CharField()
+                ),
                 updated_at=models.F('updated_at')
             )
-            updated_count += updated
         
         logger.info(
             f"Updated TOR results for {account_id}: "
@@ -478,32 +822,24 @@ class CurriculumService:
         Returns:
             Dictionary with statistics
         """
-        from django.db.models import Count, Avg
-        
-        entries = CompareResultTOR.objects.filter(account_id=account_id)
-        
-        stats = {
-            'total': entries.count(),
-            'accepted': entries.filter(
-                credit_evaluation=CompareResultTOR.CreditEvaluation.ACCEPTED
-            ).count(),
-            'denied': entries.filter(
-                credit_evaluation=CompareResultTOR.CreditEvaluation.DENIED
-            ).count(),
-            'void': entries.filter(
-                credit_evaluation=CompareResultTOR.CreditEvaluation.VOID
-            ).count(),
-            'passed': entries.filter(remarks='PASSED').count(),
-            'failed': entries.filter(remarks='FAILED').count(),
-        }
+        from django.db.models import Count, Avg, Sum
+        
+        evaluation = CompareResultTOR.CreditEvaluation
+        stats = CompareResultTOR.objects.filter(account_id=account_id).aggregate(
+            total=Count('id'),
+            accepted=Count('id', filter=Q(credit_evaluation=evaluation.ACCEPTED)),
+            denied=Count('id', filter=Q(credit_evaluation=evaluation.DENIED)),
+            void=Count('id', filter=Q(credit_evaluation=evaluation.VOID)),
+            passed=Count('id', filter=Q(remarks='PASSED')),
+            failed=Count('id', filter=Q(remarks='FAILED')),
+            average_grade=Avg('final_grade'),
+            total_units=Sum('total_academic_units'),
+        )
         
-        # Calculate average grade
-        avg_grade = entries.aggregate(Avg('final_grade'))['final_grade__avg']
+        # Avg/Sum return None when the account has no entries
+        avg_grade = stats['average_grade']
         stats['average_grade'] = round(avg_grade, 2) if avg_grade else 0.0
-        
-        # Calculate total units
-        total_units = sum(entry.total_academic_units for entry in entries)
-        stats['total_units'] = total_units
+        stats['total_units'] = stats['total_units'] or 0
         
         return stats
     
@@ -0,0 +1,20 @@
+"""
+Signal handlers for curriculum models.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import CitTorContent
+from .services import bump_cit_cache_version
+
+
+@receiver(post_save, sender=CitTorContent)
+@receiver(post_delete, sender=CitTorContent)
+def invalidate_cit_cache(sender, **kwargs):
+    """
+    Invalidate the cached CIT curriculum.
+    
+    Bumped only on commit so a rolled back change never invalidates (or
+    populates) the shared cache; until then load_cit_cache reads around it.
+    """
+    transaction.on_commit(bump_cit_cache_version)
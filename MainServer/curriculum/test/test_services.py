@@ -1,9 +1,16 @@
 """Tests for curriculum services"""
+import threading
 import pytest
-from curriculum.services import CurriculumService
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from curriculum.services import CurriculumService, get_cit_cache_version
 from curriculum.models import CompareResultTOR, CitTorContent
 from torchecker.models import TorTransferee
-from core.exceptions import ValidationException, ResourceNotFoundException
+from core.exceptions import (
+    ValidationException,
+    ResourceNotFoundException,
+    ResourceLockedException
+)
 
 
 @pytest.mark.django_db
@@ -28,6 +35,43 @@ class TestCurriculumService:
         )
         
         assert similarity == 100.0
+
+    def test_calculate_similarity_matrix(self):
+        """Test batch similarity matrix matches pairwise scores"""
+        queries = ["data structures", "intro to programming"]
+        choices = ["data structures", "introduction to programming", "ethics"]
+
+        scores = CurriculumService.calculate_similarity_matrix(queries, choices)
+
+        assert scores.shape == (2, 3)
+        assert scores[0][0] == 100.0
+        assert scores[1].argmax() == 1
+        assert scores[1][1] == pytest.approx(
+            CurriculumService.calculate_similarity(queries[1], choices[1]),
+            rel=1e-4
+        )
+
+    def test_calculate_similarity_matrix_empty_texts(self):
+        """Test empty texts score 0 in the batch path like calculate_similarity"""
+        scores = CurriculumService.calculate_similarity_matrix(
+            ["", "data structures", ""],
+            ["", "data structures"]
+        )
+        
+        assert CurriculumService.calculate_similarity("", "") == 0.0
+        assert scores.tolist() == [[0.0, 0.0], [0.0, 100.0], [0.0, 0.0]]
+    
+    def test_find_description_matches_empty_description(self):
+        """Test an empty TOR description is never matched to an empty CIT one"""
+        entries = [
+            CompareResultTOR(subject_code="TOR01", subject_description=""),
+            CompareResultTOR(subject_code="TOR02", subject_description="   ")
+        ]
+        cit_cache = [{'subject_code': "EMPTY101", 'normalized_descriptions': [""]}]
+        
+        matches = CurriculumService.find_description_matches(entries, cit_cache)
+        
+        assert matches == [(0.0, None), (0.0, None)]
     
     def test_apply_standard_grading(self):
         """Test standard grading application"""
@@ -80,6 +124,32 @@ class TestCurriculumService:
         with pytest.raises(ResourceNotFoundException):
             CurriculumService.apply_standard_grading("NONEXISTENT")
     
+    def test_apply_grading_account_locked(self):
+        """Test grading an account another transaction is processing"""
+        locked = threading.Event()
+        release = threading.Event()
+        
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    CurriculumService.lock_account("LOCK001")
+                    locked.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+        
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        
+        try:
+            assert locked.wait(timeout=10)
+            with pytest.raises(ResourceLockedException) as exc_info:
+                CurriculumService.apply_standard_grading("LOCK001")
+            assert exc_info.value.status_code == 409
+        finally:
+            release.set()
+            holder.join()
+    
     def test_copy_tor_entries(self):
         """Test copying TOR entries"""
         # Create transferee entry
@@ -133,6 +203,99 @@ class TestCurriculumService:
         assert len(results) == 1
         assert results[0]['match_accuracy'] > 0
         assert results[0]['matched_subject'] is not None
+
+    def test_sync_curriculum_matching_evaluation_bands(self):
+        """Test short and long descriptions land in the expected bands"""
+        CitTorContent.objects.create(
+            subject_code="CC103",
+            description=["Object Oriented Programming"],
+            units=3
+        )
+        CitTorContent.objects.create(
+            subject_code="GE102",
+            description=["Readings in Philippine History"],
+            units=3
+        )
+        CitTorContent.objects.create(
+            subject_code="GE104",
+            description=["Mathematics in the Modern World"],
+            units=3
+        )
+        
+        for code, description in [
+            ("TOR01", "Readings in Philippine History"),
+            ("TOR02", "Programming"),
+            ("TOR03", "Math"),
+        ]:
+            CompareResultTOR.objects.create(
+                account_id="BANDS001",
+                subject_code=code,
+                subject_description=description,
+                total_academic_units=3.0,
+                final_grade=1.5
+            )
+        
+        results = {
+            r['subject_code']: r
+            for r in CurriculumService.sync_curriculum_matching("BANDS001")
+        }
+        
+        # Full description match is accepted
+        assert results["TOR01"]['matched_subject'] == "GE102"
+        assert results["TOR01"]['credit_evaluation'] == CompareResultTOR.CreditEvaluation.ACCEPTED
+        # A single shared word is not enough to auto-accept
+        assert results["TOR02"]['matched_subject'] == "CC103"
+        assert results["TOR02"]['credit_evaluation'] == CompareResultTOR.CreditEvaluation.VOID
+        # A short prefix of a long description is denied
+        assert results["TOR03"]['matched_subject'] == "GE104"
+        assert results["TOR03"]['credit_evaluation'] == CompareResultTOR.CreditEvaluation.DENIED
+    
+    def test_load_cit_cache_reloads_on_version_change(self, django_capture_on_commit_callbacks):
+        """Test committed CIT changes invalidate the memoized curriculum"""
+        before = CurriculumService.load_cit_cache()
+        version = get_cit_cache_version()
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            cit = CitTorContent.objects.create(
+                subject_code="CACHE101",
+                description=["Cache Invalidation"],
+                units=3
+            )
+        # Executed callbacks stay queued on the test transaction, which
+        # would make load_cit_cache bypass the memo
+        connection.run_on_commit.clear()
+        
+        assert get_cit_cache_version() != version
+        created = CurriculumService.load_cit_cache()
+        assert created is not before
+        assert "CACHE101" in {c['subject_code'] for c in created}
+        # Unchanged version is served from the memo
+        assert CurriculumService.load_cit_cache() is created
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            cit.delete()
+        connection.run_on_commit.clear()
+        
+        deleted = CurriculumService.load_cit_cache()
+        assert deleted is not created
+        assert "CACHE101" not in {c['subject_code'] for c in deleted}
+    
+    def test_load_cit_cache_ignores_rolled_back_changes(self):
+        """Test uncommitted CIT changes are visible but never memoized"""
+        before = CurriculumService.load_cit_cache()
+        
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                CitTorContent.objects.create(
+                    subject_code="PHANTOM101",
+                    description=["Rolled Back"],
+                    units=3
+                )
+                pending = CurriculumService.load_cit_cache()
+                assert "PHANTOM101" in {c['subject_code'] for c in pending}
+                raise RuntimeError
+        
+        assert CurriculumService.load_cit_cache() is before
     
     def test_update_credit_evaluation(self):
         """Test updating credit evaluation"""
@@ -170,6 +333,64 @@ class TestCurriculumService:
                 None
             )
     
+    def test_update_tor_results(self):
+        """Test deleting failed subjects and updating passed ones"""
+        for account_id, code in [
+            ("RESULTS001", "CS101"),
+            ("RESULTS001", "CS102"),
+            ("RESULTS001", "CS103"),
+            ("RESULTS002", "CS101"),
+        ]:
+            CompareResultTOR.objects.create(
+                account_id=account_id,
+                subject_code=code,
+                subject_description="Test",
+                total_academic_units=3.0,
+                final_grade=2.0,
+                remarks="PENDING"
+            )
+        
+        counts = CurriculumService.update_tor_results(
+            "RESULTS001",
+            ["CS103"],
+            [
+                {"subject_code": "CS101", "remarks": "FIRST"},
+                {"subject_code": "CS102", "remarks": "PASSED"},
+                {"subject_code": "CS101", "remarks": "CREDITED"},
+            ]
+        )
+        
+        remarks = dict(
+            CompareResultTOR.objects.filter(account_id="RESULTS001")
+            .values_list('subject_code', 'remarks')
+        )
+        
+        assert counts == {"deleted": 1, "updated": 2}
+        # Duplicate codes resolve to the last entry
+        assert remarks == {"CS101": "CREDITED", "CS102": "PASSED"}
+        # Same code on another account is untouched
+        assert CompareResultTOR.objects.get(
+            account_id="RESULTS002", subject_code="CS101"
+        ).remarks == "PENDING"
+    
+    def test_update_tor_results_no_passed_subjects(self):
+        """Test an empty passed list issues no UPDATE"""
+        CompareResultTOR.objects.create(
+            account_id="RESULTS003",
+            subject_code="CS101",
+            subject_description="Test",
+            total_academic_units=3.0,
+            final_grade=2.0,
+            remarks="PENDING"
+        )
+        
+        with CaptureQueriesContext(connection) as queries:
+            counts = CurriculumService.update_tor_results("RESULTS003", [], [])
+        
+        assert counts == {"deleted": 0, "updated": 0}
+        assert not any(q['sql'].startswith('UPDATE') for q in queries.captured_queries)
+        assert CompareResultTOR.objects.get(account_id="RESULTS003").remarks == "PENDING"
+    
     def test_get_comparison_statistics(self):
         """Test getting comparison statistics"""
         # Create various entries
@@ -201,4 +422,5 @@ class TestCurriculumService:
         assert stats['passed'] == 1
         assert stats['failed'] == 1
         assert stats['average_grade'] > 0
-        assert stats['total_units'] == 6.0
\ No newline at end of file
+        assert stats['total_units'] == 6.0
+
@@ -79,15 +79,14 @@ def track_user_progress(request):
     )
     
     data = []
-    if documents.exists():
-        for doc in documents[:5]:
-            data.append({
-                'id': doc.id,
-                'account_id': doc.accountID,
-                'created_at': doc.accepted_date or doc.request_date,
-                'status': doc.status,
-                'type': 'final'
-            })
+    for doc in documents[:5]:
+        data.append({
+            'id': doc.id,
+            'account_id': doc.accountID,
+            'created_at': doc.accepted_date or doc.request_date,
+            'status': doc.status,
+            'type': 'final'
+        })
             
     return APIResponse.success({'data': data, 'exists': len(data) > 0})
 
@@ -137,14 +137,13 @@ def track_user_progress(request):
     )
     
     data = []
-    if requests.exists():
-        for req in requests[:5]:
-            data.append({
-                'id': req.id,
-                'account_id': req.applicant_id,
-                'created_at': req.request_date,
-                'status': req.status,
-                'type': 'pending'
-            })
+    for req in requests[:5]:
+        data.append({
+            'id': req.id,
+            'account_id': req.applicant_id,
+            'created_at': req.request_date,
+            'status': req.status,
+            'type': 'pending'
+        })
             
     return APIResponse.success({'data': data, 'exists': len(data) > 0})
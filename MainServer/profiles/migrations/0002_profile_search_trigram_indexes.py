@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-14 06:01
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='profile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='profile_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='profile_email_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('school_name'), name='gin_trgm_ops'), name='profile_school_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('user_id'), name='gin_trgm_ops'), name='profile_user_id_trgm'),
+        ),
+    ]
@@ -2,6 +2,9 @@
 User profile models with improved validation and structure.
 """
 from django.db import models
+from django.db.models import Case, When, Value, Q, ExpressionWrapper
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from core.validators import validate_account_id, validate_phone_number
 import re
@@ -15,6 +18,9 @@ class Profile(models.Model):
     One profile per user account.
     """
     
+    # Fields counted towards completion_percentage
+    COMPLETION_FIELDS = ['name', 'school_name', 'email', 'phone', 'address', 'date_of_birth']
+    
     user_id = models.CharField(
         max_length=255,
         unique=True,
@@ -74,6 +80,11 @@ class Profile(models.Model):
             models.Index(fields=['user_id']),
             models.Index(fields=['email']),
             models.Index(fields=['is_complete']),
+            # Trigram indexes for icontains search (matches UPPER(col) LIKE ...)
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='profile_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='profile_email_trgm'),
+            GinIndex(OpClass(Upper('school_name'), name='gin_trgm_ops'), name='profile_school_trgm'),
+            GinIndex(OpClass(Upper('user_id'), name='gin_trgm_ops'), name='profile_user_id_trgm'),
         ]
         ordering = ['-created_at']
 
@@ -103,6 +114,13 @@ class Profile(models.Model):
         """Override save to check completeness and run validation"""
         self.full_clean()
         self.check_completeness()
+        
+        # Keep the recomputed flag when only some fields are written
+        # (an empty update_fields stays a no-op)
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            kwargs['update_fields'] = {*update_fields, 'is_complete'}
+        
         super().save(*args, **kwargs)
 
     def check_completeness(self):
@@ -130,6 +148,33 @@ class Profile(models.Model):
     @property
     def completion_percentage(self) -> int:
         """Calculate profile completion percentage"""
-        fields = ['name', 'school_name', 'email', 'phone', 'address', 'date_of_birth']
+        fields = self.COMPLETION_FIELDS
         filled = sum(1 for field in fields if getattr(self, field))
-        return int((filled / len(fields)) * 100)
\ No newline at end of file
+        return int((filled / len(fields)) * 100)
+
+    @classmethod
+    def completion_percentage_expression(cls) -> ExpressionWrapper:
+        """
+        Database expression equivalent to completion_percentage.
+        
+        Lets querysets annotate or aggregate completion without loading
+        rows into Python. Empty strings count as unfilled, as they do
+        in the property.
+        """
+        filled = None
+        for name in cls.COMPLETION_FIELDS:
+            condition = Q(**{f'{name}__isnull': False})
+            if not isinstance(cls._meta.get_field(name), models.DateField):
+                condition &= ~Q(**{name: ''})
+            term = Case(
+                When(condition, then=Value(1)),
+                default=Value(0),
+                output_field=models.IntegerField()
+            )
+            filled = term if filled is None else filled + term
+        
+        # Integer division truncates like int() in the property
+        return ExpressionWrapper(
+            filled * 100 / len(cls.COMPLETION_FIELDS),
+            output_field=models.IntegerField()
+        )
\ No newline at end of file
@@ -4,6 +4,7 @@ All profile CRUD operations should be here.
 """
 from typing import Optional, Dict, List
 from django.db import transaction
+from django.db.models import QuerySet
 from core.exceptions import (
     ValidationException,
     ResourceNotFoundException,
@@ -171,27 +172,19 @@ class ProfileService:
             else:
                 cleaned_kwargs[key] = value
         
-        try:
-            # Try to get existing profile
-            profile = Profile.objects.get(user_id=user_id)
-            
-            # Update existing profile
-            for key, value in cleaned_kwargs.items():
-                if hasattr(profile, key):
-                    setattr(profile, key, value)
-            
-            profile.save()
-            
-            logger.info(f"Profile updated for user: {user_id}")
-            
-        except Profile.DoesNotExist:
-            # Create new profile
-            profile = Profile.objects.create(
-                user_id=user_id,
-                **cleaned_kwargs
-            )
-            
+        # Single upsert; only the given columns are written on update
+        profile, created = Profile.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                key: value for key, value in cleaned_kwargs.items()
+                if hasattr(Profile, key)
+            }
+        )
+        
+        if created:
             logger.info(f"Profile created for user: {user_id}")
+        else:
+            logger.info(f"Profile updated for user: {user_id}")
         
         return profile
     
@@ -218,16 +211,20 @@ class ProfileService:
     def get_all_profiles(
         is_complete: Optional[bool] = None,
         search: Optional[str] = None
-    ) -> List[Profile]:
+    ) -> QuerySet[Profile]:
         """
         Get all profiles with optional filtering.
         
+        Search uses the trigram indexes on Profile, so only matching rows
+        are read. The queryset is returned unevaluated so callers can
+        paginate it.
+        
         Args:
             is_complete: Filter by completion status (optional)
             search: Search term for name, email, or school (optional)
             
         Returns:
-            List of Profile instances
+            QuerySet of Profile instances
         """
         queryset = Profile.objects.all()
         
@@ -245,7 +242,7 @@ class ProfileService:
                 Q(user_id__icontains=search)
             )
         
-        return list(queryset)
+        return queryset
     
     @staticmethod
     @log_execution
@@ -303,15 +300,17 @@ class ProfileService:
         Returns:
             Dictionary with profile counts and statistics
         """
-        from django.db.models import Count, Avg
+        from django.db.models import Count, Avg, Q
         
-        total = Profile.objects.count()
-        complete = Profile.objects.filter(is_complete=True).count()
+        stats = Profile.objects.aggregate(
+            total=Count('id'),
+            complete=Count('id', filter=Q(is_complete=True)),
+            avg_completion=Avg(Profile.completion_percentage_expression())
+        )
+        total = stats['total']
+        complete = stats['complete']
         incomplete = total - complete
-        
-        # Calculate average completion percentage
-        profiles = Profile.objects.all()
-        avg_completion = sum(p.completion_percentage for p in profiles) / total if total > 0 else 0
+        avg_completion = stats['avg_completion'] or 0
         
         return {
             'total': total,
@@ -1,6 +1,8 @@
 """Tests for profiles models"""
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from profiles.models import Profile
 from datetime import date
 
@@ -81,7 +83,22 @@ class TestProfile:
         
         # 3 out of 6 fields filled = 50%
         assert profile.completion_percentage == 50
-    
+
+    def test_completion_percentage_expression(self):
+        """Test DB completion expression matches the property"""
+        profile = Profile.objects.create(
+            user_id="TEST008B",
+            name="Test",
+            school_name="",
+            address="Somewhere"
+        )
+
+        annotated = Profile.objects.annotate(
+            completion=Profile.completion_percentage_expression()
+        ).get(user_id="TEST008B")
+
+        assert annotated.completion == profile.completion_percentage == 33
+
     def test_completeness_check(self):
         """Test completeness checking"""
         # Incomplete profile
@@ -101,6 +118,17 @@ class TestProfile:
         )
         assert complete.is_complete is True
     
+    def test_save_empty_update_fields(self):
+        """Test save with empty update_fields stays a no-op"""
+        profile = Profile.objects.create(user_id="TEST010B", name="Test")
+        profile.name = "Changed"
+        
+        with CaptureQueriesContext(connection) as queries:
+            profile.save(update_fields=[])
+        
+        assert not any(q['sql'].startswith('UPDATE') for q in queries.captured_queries)
+        assert Profile.objects.get(user_id="TEST010B").name == "Test"
+    
     def test_email_validation(self):
         """Test email validation"""
         with pytest.raises(ValidationError) as exc_info:
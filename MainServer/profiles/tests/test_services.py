@@ -95,6 +95,22 @@ class TestProfileService:
         assert updated.name == "Updated"
         assert Profile.objects.filter(user_id="SAVE002").count() == 1
     
+    def test_save_profile_update_completeness(self):
+        """Test save_profile keeps is_complete in sync on update"""
+        ProfileService.create_profile(
+            user_id="SAVE003",
+            name="Test",
+            school_name="School",
+            email="test@example.com"
+        )
+        assert Profile.objects.get(user_id="SAVE003").is_complete is False
+        
+        ProfileService.save_profile(user_id="SAVE003", phone="1234567890")
+        assert Profile.objects.get(user_id="SAVE003").is_complete is True
+        
+        ProfileService.save_profile(user_id="SAVE003", email="")
+        assert Profile.objects.get(user_id="SAVE003").is_complete is False
+    
     def test_get_profile(self):
         """Test getting a profile"""
         created = ProfileService.create_profile(
@@ -246,14 +246,13 @@ def track_user_progress(request):
     # Return data if exists, else empty list
     # We serialize basic info
     data = []
-    if requests.exists():
-        for req in requests[:5]:  # Limit to 5
-            data.append({
-                'id': req.id,
-                'account_id': req.accountID,
-                'created_at': req.request_date,
-                'status': req.status,
-                'type': 'request'
-            })
+    for req in requests[:5]:  # Limit to 5
+        data.append({
+            'id': req.id,
+            'account_id': req.accountID,
+            'created_at': req.request_date,
+            'status': req.status,
+            'type': 'request'
+        })
             
     return APIResponse.success({'data': data, 'exists': len(data) > 0})
\ No newline at end of file